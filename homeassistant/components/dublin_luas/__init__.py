@@ -1,26 +1,40 @@
 """The Dublin Luas integration."""
 from __future__ import annotations
 
-from luas.api import LuasClient, LuasDirection, LuasLine
+import asyncio
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import LuasApi
 from .const import DOMAIN
 
-PLATFORMS: list[str] = ["sensor"]
+PLATFORMS: tuple[str, ...] = ("sensor",)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Dublin Luas from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = LuasClient()
+    hass.data[DOMAIN][entry.entry_id] = LuasApi(async_get_clientsession(hass))
 
-    hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+    await asyncio.gather(
+        *(
+            hass.config_entries.async_forward_entry_setup(entry, platform)
+            for platform in PLATFORMS
+        )
+    )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Update options."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -0,0 +1,90 @@
+"""Async client for the Dublin Luas forecasting API."""
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import ClientSession, ClientTimeout
+import defusedxml.ElementTree as ET
+from luas.api import (
+    ATTR_DESTINATION,
+    ATTR_DESTINATION_VAL,
+    ATTR_DIRECTION,
+    ATTR_DUE,
+    ATTR_DUE_VAL,
+    ATTR_INBOUND_VAL,
+    ATTR_NO_TRAMS,
+    ATTR_OUTBOUND_VAL,
+    ATTR_STATUS,
+    ATTR_TRAMS,
+    DEFAULT_GREEN_LINE_STOP,
+    DEFAULT_LUAS_API,
+    DEFAULT_RED_LINE_STOP,
+    XPATH_DIRECTION_INBOUND,
+    XPATH_DIRECTION_OUTBOUND,
+    XPATH_STATUS,
+)
+from luas.models import LuasLine
+
+from homeassistant.exceptions import HomeAssistantError
+
+DEFAULT_TIMEOUT = 10
+
+_DIRECTIONS = (
+    (ATTR_INBOUND_VAL, XPATH_DIRECTION_INBOUND),
+    (ATTR_OUTBOUND_VAL, XPATH_DIRECTION_OUTBOUND),
+)
+
+
+class LuasApi:
+    """Fetch Luas forecasts over a shared aiohttp session.
+
+    Returns the same data as luas.api.LuasClient, whose blocking requests
+    had to run in the executor.
+    """
+
+    def __init__(self, session: ClientSession) -> None:
+        """Initialize the client."""
+        self._session = session
+
+    async def stop_details(
+        self, stop: str, timeout: float = DEFAULT_TIMEOUT
+    ) -> dict[str, Any]:
+        """Return the status and the forecast trams of a stop."""
+        params = {"action": "forecast", "encrypt": "false", "stop": stop}
+        async with self._session.get(
+            DEFAULT_LUAS_API, params=params, timeout=ClientTimeout(total=timeout)
+        ) as resp:
+            resp.raise_for_status()
+            content = await resp.read()
+
+        tree = ET.fromstring(content)
+        status = tree.find(XPATH_STATUS)
+        if status is None or status.text is None:
+            raise InvalidResponse(f"No status in the response for stop {stop}")
+
+        return {
+            ATTR_STATUS: status.text.strip(),
+            ATTR_TRAMS: [
+                {
+                    ATTR_DUE: tram.attrib[ATTR_DUE_VAL],
+                    ATTR_DIRECTION: direction,
+                    ATTR_DESTINATION: tram.attrib[ATTR_DESTINATION_VAL],
+                }
+                for direction, xpath in _DIRECTIONS
+                for tram in tree.findall(xpath)
+                if tram.attrib[ATTR_DESTINATION_VAL] != ATTR_NO_TRAMS
+            ],
+        }
+
+    async def line_status(
+        self, line: LuasLine, timeout: float = DEFAULT_TIMEOUT
+    ) -> str:
+        """Return the status message of a line."""
+        stop = (
+            DEFAULT_RED_LINE_STOP if line == LuasLine.Red else DEFAULT_GREEN_LINE_STOP
+        )
+        return (await self.stop_details(stop, timeout))[ATTR_STATUS]
+
+
+class InvalidResponse(HomeAssistantError):
+    """Error to indicate the API returned an unexpected response."""
@@ -5,48 +5,54 @@ import logging
 from typing import Any
 
 from luas.api import ATTR_INBOUND_VAL, ATTR_OUTBOUND_VAL
-from luas.models import LUAS_STOPS, LuasDirection, LuasStops
+from luas.models import LUAS_STOPS
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    CONF_STATUS_INTERVAL,
+    CONF_STOP_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_STOP_INTERVAL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-LUAS_DESTINATIONS = {"BRI", "SAN", "PAR", "BRO", "TAL", "SAG", "CON", "TPT"}
+LUAS_DESTINATIONS = frozenset({"BRI", "SAN", "PAR", "BRO", "TAL", "SAG", "CON", "TPT"})
+
+_SORTED_STOPS = sorted(LUAS_STOPS, key=lambda s: s["name"])
+_STOP_CHOICES = {stop["abrev"]: stop["name"] for stop in _SORTED_STOPS}
+_DESTINATION_CHOICES = {
+    stop["abrev"]: stop["name"]
+    for stop in _SORTED_STOPS
+    if stop["abrev"] in LUAS_DESTINATIONS
+}
+_DIRECTION_CHOICES = {
+    ATTR_INBOUND_VAL: ATTR_INBOUND_VAL,
+    ATTR_OUTBOUND_VAL: ATTR_OUTBOUND_VAL,
+}
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required("stop"): vol.In(
-            {
-                stop["abrev"]: stop["name"]
-                for stop in sorted(LUAS_STOPS, key=lambda s: s["name"])
-            }
-        ),
-        vol.Required("direction"): vol.In(
-            {ATTR_INBOUND_VAL: ATTR_INBOUND_VAL, ATTR_OUTBOUND_VAL: ATTR_OUTBOUND_VAL}
-        ),
-        vol.Optional("destination"): vol.In(
-            {
-                stop["abrev"]: stop["name"]
-                for stop in sorted(LUAS_STOPS, key=lambda s: s["name"])
-                if stop["abrev"] in LUAS_DESTINATIONS
-            }
-        ),
+        vol.Required("stop"): vol.In(_STOP_CHOICES),
+        vol.Required("direction"): vol.In(_DIRECTION_CHOICES),
+        vol.Optional("destination"): vol.In(_DESTINATION_CHOICES),
         vol.Optional("walk_time"): int,
     }
 )
 
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    if not LuasStops().stop_exists(data["stop"]):
+    if data["stop"] not in _STOP_CHOICES:
         raise InvalidLuasStop
-    if "destination" in data and not LuasStops().stop_exists(data["destination"]):
+    if "destination" in data and data["destination"] not in _STOP_CHOICES:
         raise InvalidLuasDestination
-    if data["direction"] not in [ATTR_INBOUND_VAL, ATTR_OUTBOUND_VAL]:
+    if data["direction"] not in _DIRECTION_CHOICES:
         raise InvalidDirection
     title = f"{data['direction']} from {data['stop']}"
     if "destination" in data:
@@ -80,12 +86,66 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
+            unique_id = "_".join(
+                filter(
+                    None,
+                    (
+                        user_input["stop"],
+                        user_input["direction"],
+                        user_input.get("destination"),
+                    ),
+                )
+            )
+            await self.async_set_unique_id(unique_id.lower())
+            self._abort_if_unique_id_configured()
             return self.async_create_entry(title=info["title"], data=user_input)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle an options flow for Dublin Luas."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling intervals."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STOP_INTERVAL,
+                        default=options.get(CONF_STOP_INTERVAL, DEFAULT_STOP_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Optional(
+                        CONF_STATUS_INTERVAL,
+                        default=options.get(
+                            CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                }
+            ),
+        )
+
 
 class InvalidDirection(HomeAssistantError):
     """Error to indicate incorrect direction."""
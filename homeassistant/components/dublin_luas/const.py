@@ -1,3 +1,9 @@
 """Constants for the Dublin Luas integration."""
 
 DOMAIN = "dublin_luas"
+
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_STOP_INTERVAL = "stop_interval"
+
+DEFAULT_STATUS_INTERVAL = 300
+DEFAULT_STOP_INTERVAL = 30
@@ -1,8 +1,9 @@
+from __future__ import annotations
+
+import asyncio
 from datetime import timedelta
-from functools import partial
 import logging
 
-import async_timeout
 from luas.api import (
     ATTR_DESTINATION,
     ATTR_DIRECTION,
@@ -11,17 +12,18 @@ from luas.api import (
     ATTR_INBOUND_VAL,
     ATTR_STATUS,
     ATTR_TRAMS,
-    LuasClient,
     LuasDirection,
     LuasLine,
 )
-from luas.models import LuasStops, LuasTram
+from luas.models import LUAS_STOPS, LuasTram
 
+from homeassistant.components import persistent_notification
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import TIME_MINUTES
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.update_coordinator import (
@@ -30,11 +32,26 @@ from homeassistant.helpers.update_coordinator import (
     UpdateFailed,
 )
 
-from .const import DOMAIN
+from .api import LuasApi
+from .const import (
+    CONF_STATUS_INTERVAL,
+    CONF_STOP_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_STOP_INTERVAL,
+    DOMAIN,
+)
 
 ICON = "mdi:tram"
 _LOGGER = logging.getLogger(__name__)
 
+_STOPS = {stop["abrev"]: stop for stop in LUAS_STOPS}
+
+# Number of departures listed by LuasNextDeparturesSensor
+NEXT_DEPARTURES = 4
+
+# Key in the stop coordinator data caching the trams filtered by the sensors
+_FILTERED_TRAMS = "filtered_trams"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -42,45 +59,48 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> bool:
     """Config entry example."""
-    api = hass.data[DOMAIN][entry.entry_id]
+    api: LuasApi = hass.data[DOMAIN][entry.entry_id]
+    stop = entry.data["stop"]
+    direction = entry.data["direction"]
+    destination = entry.data.get("destination")
 
     async def async_update_stop_data():
         try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with async_timeout.timeout(30):
-                return await hass.async_add_executor_job(
-                    partial(api.stop_details, entry.data["stop"])
-                )
+            data = await api.stop_details(stop, timeout=30)
+            trams = data[ATTR_TRAMS]
+            for tram in trams:
+                due = tram[ATTR_DUE]
+                tram[ATTR_DUE] = 0 if due == "DUE" else int(due)
+            return {ATTR_TRAMS: trams, _FILTERED_TRAMS: {}}
         except Exception as err:
             _LOGGER.exception("Error while requesting Luas stop details")
             raise UpdateFailed(f"Error communicating with API: {err}")
 
     async def async_update_status_data():
         try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with async_timeout.timeout(10):
-                green_status = await hass.async_add_executor_job(
-                    partial(api.line_status, LuasLine.Green)
-                )
-                red_status = await hass.async_add_executor_job(
-                    partial(api.line_status, LuasLine.Red)
-                )
-                return {
-                    "green": green_status,
-                    "red": red_status,
-                }
+            green_status, red_status = await asyncio.gather(
+                api.line_status(LuasLine.Green), api.line_status(LuasLine.Red)
+            )
+            return {
+                "green": green_status,
+                "red": red_status,
+            }
         except Exception as err:
             _LOGGER.exception("Error while requesting Luas status details")
             raise UpdateFailed(f"Error communicating with API: {err}")
 
+    stop_interval = entry.options.get(CONF_STOP_INTERVAL, DEFAULT_STOP_INTERVAL)
+    status_interval = entry.options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL)
+    # Round the status interval up to a multiple of the stop interval, so that
+    # both coordinators refresh on the same tick
+    status_interval = -(-status_interval // stop_interval) * stop_interval
+
     stop_coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name="luas_stop_data",
         update_method=async_update_stop_data,
-        update_interval=timedelta(seconds=30),
+        update_interval=timedelta(seconds=stop_interval),
     )
 
     status_coordinator = DataUpdateCoordinator(
@@ -88,276 +108,265 @@ async def async_setup_entry(
         _LOGGER,
         name="luas_status_data",
         update_method=async_update_status_data,
-        update_interval=timedelta(seconds=120),
+        update_interval=timedelta(seconds=status_interval),
     )
 
-    await stop_coordinator.async_config_entry_first_refresh()
-    await status_coordinator.async_config_entry_first_refresh()
-
-    async_add_entities(
-        [
-            LuasStatusSensor(status_coordinator, "green"),
-            LuasStatusSensor(status_coordinator, "red"),
-            LuasTramSensor(
-                stop_coordinator,
-                0,
-                entry.data["stop"],
-                entry.data["direction"],
-                entry.data.get("destination"),
-            ),
-            LuasTramSensor(
-                stop_coordinator,
-                1,
-                entry.data["stop"],
-                entry.data["direction"],
-                entry.data.get("destination"),
-            ),
-            LuasTramSensor(
-                stop_coordinator,
-                2,
-                entry.data["stop"],
-                entry.data["direction"],
-                entry.data.get("destination"),
-            ),
-            LuasTramSensor(
-                stop_coordinator,
-                3,
-                entry.data["stop"],
-                entry.data["direction"],
-                entry.data.get("destination"),
-            ),
-        ]
+    # Each of the next departures used to have its own sensor. The first one
+    # lives on as LuasNextDeparturesSensor, the others are now attributes.
+    registry = er.async_get(hass)
+    removed = []
+    for number in range(2, NEXT_DEPARTURES + 1):
+        if entity_id := registry.async_get_entity_id(
+            "sensor", DOMAIN, _departure_unique_id(stop, direction, destination, number)
+        ):
+            registry.async_remove(entity_id)
+            removed.append(entity_id)
+    if removed:
+        unique_id = _departure_unique_id(stop, direction, destination, 1)
+        departures_entity_id = (
+            registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+            or f"sensor.{unique_id}"
+        )
+        _LOGGER.warning(
+            "Removed %s, their departures are now listed in the departures "
+            "attribute of %s",
+            ", ".join(removed),
+            departures_entity_id,
+        )
+        persistent_notification.async_create(
+            hass,
+            "The following Dublin Luas sensors were removed, their departures are "
+            "now listed in the `departures` attribute of "
+            f"`{departures_entity_id}`. "
+            "Please update any automations, scripts or dashboards using them:\n"
+            + "".join(f"\n- `{entity_id}`" for entity_id in removed),
+            "Dublin Luas sensors removed",
+            f"{DOMAIN}_{entry.entry_id}_departures",
+        )
+
+    await asyncio.gather(
+        stop_coordinator.async_config_entry_first_refresh(),
+        status_coordinator.async_config_entry_first_refresh(),
+    )
+
+    entities: list[SensorEntity] = [
+        LuasStatusSensor(status_coordinator, line) for line in ("green", "red")
+    ]
+    entities.append(
+        LuasNextDeparturesSensor(stop_coordinator, stop, direction, destination)
     )
     if "walk_time" in entry.data:
-        async_add_entities(
-            [
-                LuasTramWaitSensor(
-                    stop_coordinator,
-                    entry.data["walk_time"],
-                    entry.data["stop"],
-                    entry.data["direction"],
-                    entry.data.get("destination"),
-                )
-            ]
+        entities.append(
+            LuasTramWaitSensor(
+                stop_coordinator, entry.data["walk_time"], stop, direction, destination
+            )
         )
+    async_add_entities(entities)
     return
 
 
-class LuasTramSensor(CoordinatorEntity, SensorEntity):
+def _filtered_trams(data, direction, destination):
+    """Return the trams going in direction (to destination) as LuasTrams.
+
+    The result is cached in the coordinator data, so the sensors sharing a
+    coordinator only filter and convert the trams once per update.
+    """
+    cache = data[_FILTERED_TRAMS]
+    key = (direction, destination)
+    if key not in cache:
+        cache[key] = [
+            _luas_tram(tram)
+            for tram in data[ATTR_TRAMS]
+            if tram[ATTR_DIRECTION] == direction
+            and (destination is None or tram[ATTR_DESTINATION] == destination)
+        ]
+    return cache[key]
+
+
+def _luas_tram(tram):
+    """Build a LuasTram from a tram of the stop coordinator data."""
+    return LuasTram(
+        due=tram[ATTR_DUE],
+        direction=tram[ATTR_DIRECTION],
+        destination=tram[ATTR_DESTINATION],
+    )
+
+
+def _departure_unique_id(stop, direction, destination, number):
+    """Return the unique id of the sensor for the numberth departure."""
+    if destination:
+        return f"luas_from_{stop}_to_{destination}_{direction}_{number}".lower()
+    return f"luas_from_{stop}_{direction}_{number}".lower()
+
+
+def _stop_device_info(stop, direction, destination, name):
+    """Return the device info shared by the sensors of a stop."""
+    return {
+        "identifiers": {
+            (
+                DOMAIN,
+                stop["abrev"],
+                direction,
+                destination["abrev"] if destination else None,
+            )
+        },
+        "model": name,
+        "default_name": name,
+        "entry_type": "service",
+    }
+
+
+class LuasNextDeparturesSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
-    def __init__(self, coordinator, index, stop, direction, destination=None):
+    __slots__ = (
+        "_stop",
+        "_direction",
+        "_destination",
+        "_dest_name",
+        "_trams",
+        "_departures",
+    )
+
+    _attr_icon = ICON
+    _attr_native_unit_of_measurement = TIME_MINUTES
+
+    def __init__(self, coordinator, stop, direction, destination=None):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._index = index
-        self._stop = LuasStops().stop(stop)
+        self._stop = _STOPS[stop]
         self._direction = direction
-        self._destination = LuasStops().stop(destination) if destination else None
-        self.entity_id = f"sensor.{self.unique_id}"
-
-    @property
-    def unique_id(self) -> str:
+        self._destination = _STOPS[destination] if destination else None
+        self._dest_name = self._destination["name"] if self._destination else None
+        self._attr_unique_id = _departure_unique_id(stop, direction, destination, 1)
         if self._destination:
-            return f"luas_from_{self._stop['abrev']}_to_{self._destination['abrev']}_{self._direction}_{self._index + 1}".lower()
+            self._attr_name = f"Luas from {self._stop['name']} to {self._destination['name']} {self._direction}"
         else:
-            return f"luas_from_{self._stop['abrev']}_{self._direction}_{self._index + 1}".lower()
-
-    @property
-    def name(self) -> str:
-        if self._destination:
-            return f"Luas from {self._stop['name']} to {self._destination['name']} {self._direction}"
-        else:
-            return f"Luas from {self._stop['name']} {self._direction}"
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return TIME_MINUTES
-
-    @property
-    def icon(self) -> str:
-        return ICON
+            self._attr_name = f"Luas from {self._stop['name']} {self._direction}"
+        self._attr_device_info = _stop_device_info(
+            self._stop, self._direction, self._destination, self._attr_name
+        )
+        self.entity_id = f"sensor.{self._attr_unique_id}"
+        self._update_trams()
 
     @property
     def available(self) -> bool:
-        try:
-            return self._get_tram() is not None
-        except:
-            return False
+        return super().available and bool(self._trams)
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        return self._get_tram().due
+        return self._trams[0].due if self._trams else None
 
     @property
     def extra_state_attributes(self):
-        tram = self._get_tram()
         return {
-            "destination": tram.destination,
-            "direction": tram.direction,
+            "destination": self._trams[0].destination,
+            "direction": self._trams[0].direction,
             "stop": self._stop["name"],
+            "departures": self._departures,
         }
 
-    def _get_tram(self):
-        trams = self.coordinator.data[ATTR_TRAMS]
-        trams = [tram for tram in trams if tram[ATTR_DIRECTION] == self._direction]
-        if self._destination:
-            trams = [
-                tram
-                for tram in trams
-                if tram[ATTR_DESTINATION] == self._destination["name"]
-            ]
-        due = trams[self._index][ATTR_DUE]
-        due = 0 if due == "DUE" else int(due)
-        return LuasTram(
-            due=due,
-            direction=trams[self._index][ATTR_DIRECTION],
-            destination=trams[self._index][ATTR_DESTINATION],
-        )
-
-    @property
-    def device_info(self):
-        """Device info."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    self._stop["abrev"],
-                    self._direction,
-                    self._destination["abrev"] if self._destination else None,
-                )
-            },
-            "model": self.name,
-            "default_name": self.name,
-            "entry_type": "service",
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_trams()
+        super()._handle_coordinator_update()
+
+    def _update_trams(self):
+        self._trams = _filtered_trams(
+            self.coordinator.data, self._direction, self._dest_name
+        )[:NEXT_DEPARTURES]
+        self._departures = [
+            {
+                "due": tram.due,
+                "destination": tram.destination,
+                "direction": tram.direction,
+            }
+            for tram in self._trams
+        ]
 
 
 class LuasTramWaitSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
+    __slots__ = (
+        "_walk_time",
+        "_stop",
+        "_direction",
+        "_destination",
+        "_dest_name",
+        "_next_tram",
+    )
+
+    _attr_icon = ICON
+    _attr_native_unit_of_measurement = TIME_MINUTES
+
     def __init__(self, coordinator, walk_time, stop, direction, destination=None):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._walk_time = walk_time
-        self._stop = LuasStops().stop(stop)
+        self._stop = _STOPS[stop]
         self._direction = direction
-        self._destination = LuasStops().stop(destination) if destination else None
-        self.entity_id = f"sensor.{self.unique_id}"
-
-    @property
-    def unique_id(self) -> str:
-        if self._destination:
-            return f"luas_wait_time_from_{self._stop['abrev']}_to_{self._destination['abrev']}".lower()
-        else:
-            return f"luas_wait_time_from_{self._stop['abrev']}".lower()
-
-    @property
-    def name(self) -> str:
+        self._destination = _STOPS[destination] if destination else None
+        self._dest_name = self._destination["name"] if self._destination else None
         if self._destination:
-            return f"Luas wait time from {self._stop['name']} to {self._destination['name']} {self._direction}"
+            self._attr_unique_id = f"luas_wait_time_from_{self._stop['abrev']}_to_{self._destination['abrev']}".lower()
+            self._attr_name = f"Luas wait time from {self._stop['name']} to {self._destination['name']} {self._direction}"
         else:
-            return f"Luas wait time from {self._stop['name']} {self._direction}"
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        return TIME_MINUTES
-
-    @property
-    def icon(self) -> str:
-        return ICON
+            self._attr_unique_id = f"luas_wait_time_from_{self._stop['abrev']}".lower()
+            self._attr_name = (
+                f"Luas wait time from {self._stop['name']} {self._direction}"
+            )
+        self._attr_device_info = _stop_device_info(
+            self._stop, self._direction, self._destination, self._attr_name
+        )
+        self.entity_id = f"sensor.{self._attr_unique_id}"
+        self._next_tram = self._get_next_tram()
 
     @property
     def available(self) -> bool:
-        try:
-            self._get_next_tram()
-            return True
-        except:
-            return False
+        return super().available and self._next_tram is not None
 
     @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
-        next_tram = self._get_next_tram()
-        if next_tram:
-            return self._get_next_tram().due - self._walk_time
-        else:
-            return "unknown"
+        return (
+            None if self._next_tram is None else self._next_tram.due - self._walk_time
+        )
 
-    def _get_next_tram(self):
-        trams = self._get_trams()
-        for tram in trams:
-            if tram.due > self._walk_time:
-                return tram
-
-    def _get_trams(self):
-        trams = self.coordinator.data[ATTR_TRAMS]
-        trams = [tram for tram in trams if tram[ATTR_DIRECTION] == self._direction]
-        if self._destination:
-            trams = [
-                tram
-                for tram in trams
-                if tram[ATTR_DESTINATION] == self._destination["name"]
-            ]
-        return [
-            LuasTram(
-                due=0 if tram[ATTR_DUE] == "DUE" else int(tram[ATTR_DUE]),
-                direction=tram[ATTR_DIRECTION],
-                destination=tram[ATTR_DESTINATION],
-            )
-            for tram in trams
-        ]
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._next_tram = self._get_next_tram()
+        super()._handle_coordinator_update()
 
-    @property
-    def device_info(self):
-        """Device info."""
-        return {
-            "identifiers": {
-                (
-                    DOMAIN,
-                    self._stop["abrev"],
-                    self._direction,
-                    self._destination["abrev"] if self._destination else None,
-                )
-            },
-            "model": self.name,
-            "default_name": self.name,
-            "entry_type": "service",
-        }
+    def _get_next_tram(self):
+        trams = _filtered_trams(self.coordinator.data, self._direction, self._dest_name)
+        return next((tram for tram in trams if tram.due > self._walk_time), None)
 
 
 class LuasStatusSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Sensor."""
 
+    __slots__ = ("_line",)
+
+    _attr_icon = ICON
+    _attr_device_info = {
+        "identifiers": {(DOMAIN, "Status")},
+        "model": "Dublin Luas Status",
+        "default_name": "Dublin Luas Status",
+        "entry_type": "service",
+    }
+
     def __init__(self, coordinator, line):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._line = line
+        self._attr_unique_id = f"luas_status_{line}".lower()
+        self._attr_name = f"Luas Status {line}".capitalize()
 
     @property
-    def unique_id(self) -> str:
-        return f"luas_status_{self._line}".lower()
-
-    @property
-    def name(self) -> str:
-        """Return the name of the sensor."""
-        return f"Luas Status {self._line}".capitalize()
-
-    @property
-    def icon(self) -> str:
-        return ICON
-
-    @property
-    def state(self):
+    def native_value(self):
         """Return the state of the sensor."""
         return self.coordinator.data[self._line]
-
-    @property
-    def device_info(self):
-        """Device info."""
-        return {
-            "identifiers": {(DOMAIN, "Status")},
-            "model": "Dublin Luas Status",
-            "default_name": "Dublin Luas Status",
-            "entry_type": "service",
-        }
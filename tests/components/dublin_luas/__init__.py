@@ -1 +1,37 @@
 """Tests for the Dublin Luas integration."""
+from __future__ import annotations
+
+from xml.sax.saxutils import quoteattr
+
+from luas.api import DEFAULT_LUAS_API
+
+from tests.test_util.aiohttp import AiohttpClientMocker
+
+
+def forecast_xml(
+    inbound: list[tuple[str, str]] | None = None,
+    outbound: list[tuple[str, str]] | None = None,
+    message: str | None = "Green Line services operating normally",
+) -> str:
+    """Return a forecast response with (due, destination) trams per direction."""
+    directions = ""
+    for name, trams in (("Inbound", inbound), ("Outbound", outbound)):
+        if not trams:
+            trams = [("", "No trams forecast")]
+        tram_tags = "".join(
+            f"<tram dueMins={quoteattr(due)} destination={quoteattr(destination)} />"
+            for due, destination in trams
+        )
+        directions += f'<direction name="{name}">{tram_tags}</direction>'
+    message_tag = "" if message is None else f"<message>{message}</message>"
+    return (
+        '<stopInfo created="2021-11-06T10:00:00" stop="Sandyford" stopAbv="SAN">'
+        f"{message_tag}{directions}</stopInfo>"
+    )
+
+
+def mock_forecast(
+    aioclient_mock: AiohttpClientMocker, stop: str, text: str = "", **kwargs
+) -> None:
+    """Mock the forecast response for a stop."""
+    aioclient_mock.get(DEFAULT_LUAS_API, params={"stop": stop}, text=text, **kwargs)
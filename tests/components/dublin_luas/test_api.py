@@ -0,0 +1,96 @@
+"""Test the Dublin Luas API client."""
+from http import HTTPStatus
+from unittest.mock import patch
+
+from aiohttp import ClientResponseError, ClientTimeout
+from luas.models import LuasLine
+import pytest
+
+from homeassistant.components.dublin_luas.api import InvalidResponse, LuasApi
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from . import forecast_xml, mock_forecast
+
+from tests.test_util.aiohttp import AiohttpClientMocker
+
+
+async def test_stop_details(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a forecast is parsed into the status and trams of both directions."""
+    mock_forecast(
+        aioclient_mock,
+        "SAN",
+        forecast_xml(
+            inbound=[("DUE", "Parnell"), ("7", "Broombridge")],
+            outbound=[("3", "Bride's Glen")],
+        ),
+    )
+    api = LuasApi(async_get_clientsession(hass))
+
+    assert await api.stop_details("SAN") == {
+        "status": "Green Line services operating normally",
+        "trams": [
+            {"due": "DUE", "direction": "Inbound", "destination": "Parnell"},
+            {"due": "7", "direction": "Inbound", "destination": "Broombridge"},
+            {"due": "3", "direction": "Outbound", "destination": "Bride's Glen"},
+        ],
+    }
+
+
+async def test_stop_details_no_trams(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the no trams forecast placeholders are left out."""
+    mock_forecast(aioclient_mock, "SAN", forecast_xml(outbound=[("3", "Bride's Glen")]))
+    api = LuasApi(async_get_clientsession(hass))
+
+    assert (await api.stop_details("SAN"))["trams"] == [
+        {"due": "3", "direction": "Outbound", "destination": "Bride's Glen"},
+    ]
+
+
+async def test_stop_details_missing_message(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a response without a status message raises."""
+    mock_forecast(aioclient_mock, "SAN", forecast_xml(message=None))
+    api = LuasApi(async_get_clientsession(hass))
+
+    with pytest.raises(InvalidResponse):
+        await api.stop_details("SAN")
+
+
+async def test_stop_details_http_error(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test an HTTP error status raises."""
+    mock_forecast(aioclient_mock, "SAN", status=HTTPStatus.INTERNAL_SERVER_ERROR)
+    api = LuasApi(async_get_clientsession(hass))
+
+    with pytest.raises(ClientResponseError):
+        await api.stop_details("SAN")
+
+
+async def test_request_parameters(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the requested stop and the timeout are passed to the request."""
+    mock_forecast(aioclient_mock, "SAN", forecast_xml())
+    mock_forecast(aioclient_mock, "TAL", forecast_xml(message="Red Line normal"))
+    session = async_get_clientsession(hass)
+    api = LuasApi(session)
+
+    with patch.object(session, "get", wraps=session.get) as mock_get:
+        await api.stop_details("SAN", timeout=30)
+        assert await api.line_status(LuasLine.Red) == "Red Line normal"
+
+    assert aioclient_mock.mock_calls[0][1].query == {
+        "action": "forecast",
+        "encrypt": "false",
+        "stop": "SAN",
+    }
+    assert aioclient_mock.mock_calls[1][1].query["stop"] == "TAL"
+    assert mock_get.call_args_list[0][1]["timeout"] == ClientTimeout(total=30)
+    assert mock_get.call_args_list[1][1]["timeout"] == ClientTimeout(total=10)
@@ -2,10 +2,19 @@
 from unittest.mock import patch
 
 from homeassistant import config_entries
-from homeassistant.components.dublin_luas.config_flow import CannotConnect, InvalidAuth
-from homeassistant.components.dublin_luas.const import DOMAIN
+from homeassistant.components.dublin_luas.const import (
+    CONF_STATUS_INTERVAL,
+    CONF_STOP_INTERVAL,
+    DOMAIN,
+)
 from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import RESULT_TYPE_CREATE_ENTRY, RESULT_TYPE_FORM
+from homeassistant.data_entry_flow import (
+    RESULT_TYPE_ABORT,
+    RESULT_TYPE_CREATE_ENTRY,
+    RESULT_TYPE_FORM,
+)
+
+from tests.common import MockConfigEntry
 
 
 async def test_form(hass: HomeAssistant) -> None:
@@ -17,73 +26,98 @@ async def test_form(hass: HomeAssistant) -> None:
     assert result["errors"] is None
 
     with patch(
-        "homeassistant.components.dublin_luas.config_flow.PlaceholderHub.authenticate",
-        return_value=True,
-    ), patch(
         "homeassistant.components.dublin_luas.async_setup_entry",
         return_value=True,
     ) as mock_setup_entry:
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
-                "host": "1.1.1.1",
-                "username": "test-username",
-                "password": "test-password",
+                "stop": "STS",
+                "direction": "Inbound",
+                "destination": "BRO",
             },
         )
         await hass.async_block_till_done()
 
     assert result2["type"] == RESULT_TYPE_CREATE_ENTRY
-    assert result2["title"] == "Name of the device"
+    assert result2["title"] == "Inbound from STS to BRO"
     assert result2["data"] == {
-        "host": "1.1.1.1",
-        "username": "test-username",
-        "password": "test-password",
+        "stop": "STS",
+        "direction": "Inbound",
+        "destination": "BRO",
     }
+    assert result2["result"].unique_id == "sts_inbound_bro"
     assert len(mock_setup_entry.mock_calls) == 1
 
 
-async def test_form_invalid_auth(hass: HomeAssistant) -> None:
-    """Test we handle invalid auth."""
+async def test_form_already_configured(hass: HomeAssistant) -> None:
+    """Test we abort if the stop is already configured."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="sts_inbound_bro",
+        data={"stop": "STS", "direction": "Inbound", "destination": "BRO"},
+    ).add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    result2 = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            "stop": "STS",
+            "direction": "Inbound",
+            "destination": "BRO",
+        },
+    )
+
+    assert result2["type"] == RESULT_TYPE_ABORT
+    assert result2["reason"] == "already_configured"
+
+
+async def test_form_unknown_error(hass: HomeAssistant) -> None:
+    """Test we handle unexpected errors."""
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
 
     with patch(
-        "homeassistant.components.dublin_luas.config_flow.PlaceholderHub.authenticate",
-        side_effect=InvalidAuth,
+        "homeassistant.components.dublin_luas.config_flow.validate_input",
+        side_effect=Exception,
     ):
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
-                "host": "1.1.1.1",
-                "username": "test-username",
-                "password": "test-password",
+                "stop": "STS",
+                "direction": "Inbound",
             },
         )
 
     assert result2["type"] == RESULT_TYPE_FORM
-    assert result2["errors"] == {"base": "invalid_auth"}
+    assert result2["errors"] == {"base": "unknown"}
 
 
-async def test_form_cannot_connect(hass: HomeAssistant) -> None:
-    """Test we handle cannot connect error."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test we can change the polling intervals."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Inbound from STS",
+        data={"stop": "STS", "direction": "Inbound"},
     )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == RESULT_TYPE_FORM
+    assert result["step_id"] == "init"
 
     with patch(
-        "homeassistant.components.dublin_luas.config_flow.PlaceholderHub.authenticate",
-        side_effect=CannotConnect,
+        "homeassistant.components.dublin_luas.async_setup_entry",
+        return_value=True,
     ):
-        result2 = await hass.config_entries.flow.async_configure(
+        result2 = await hass.config_entries.options.async_configure(
             result["flow_id"],
-            {
-                "host": "1.1.1.1",
-                "username": "test-username",
-                "password": "test-password",
-            },
+            user_input={CONF_STOP_INTERVAL: 60, CONF_STATUS_INTERVAL: 600},
         )
+        await hass.async_block_till_done()
 
-    assert result2["type"] == RESULT_TYPE_FORM
-    assert result2["errors"] == {"base": "cannot_connect"}
+    assert result2["type"] == RESULT_TYPE_CREATE_ENTRY
+    assert entry.options == {CONF_STOP_INTERVAL: 60, CONF_STATUS_INTERVAL: 600}
@@ -0,0 +1,214 @@
+"""Test the Dublin Luas sensors."""
+from datetime import timedelta
+from http import HTTPStatus
+
+from homeassistant.components.dublin_luas.const import DEFAULT_STOP_INTERVAL, DOMAIN
+from homeassistant.components.dublin_luas.sensor import NEXT_DEPARTURES
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from . import forecast_xml, mock_forecast
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.test_util.aiohttp import AiohttpClientMocker
+
+CONFIG = {"stop": "SAN", "direction": "Inbound", "destination": "PAR"}
+
+DEPARTURES_ENTITY_ID = "sensor.luas_from_san_to_par_inbound_1"
+WAIT_TIME_ENTITY_ID = "sensor.luas_wait_time_from_san_to_par"
+
+TRAMS_INBOUND = [
+    ("DUE", "Parnell"),
+    ("5", "Broombridge"),
+    ("7", "Parnell"),
+    ("9", "Parnell"),
+    ("12", "Parnell"),
+    ("15", "Parnell"),
+]
+TRAMS_OUTBOUND = [("2", "Bride's Glen")]
+
+
+def mock_forecasts(
+    aioclient_mock: AiohttpClientMocker,
+    inbound=TRAMS_INBOUND,
+    outbound=TRAMS_OUTBOUND,
+    **kwargs,
+) -> None:
+    """Mock the stop forecast and the line status responses."""
+    aioclient_mock.clear_requests()
+    mock_forecast(
+        aioclient_mock,
+        "SAN",
+        forecast_xml(inbound=inbound, outbound=outbound),
+        **kwargs,
+    )
+    mock_forecast(aioclient_mock, "STS", forecast_xml())
+    mock_forecast(aioclient_mock, "TAL", forecast_xml(message="Red Line normal"))
+
+
+async def setup_entry(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Set up a config entry."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def async_update_stop(hass: HomeAssistant) -> None:
+    """Let the stop coordinator refresh."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DEFAULT_STOP_INTERVAL)
+    )
+    await hass.async_block_till_done()
+
+
+async def test_next_departures(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the next departures sensor state and attributes."""
+    mock_forecasts(aioclient_mock)
+    await setup_entry(hass, MockConfigEntry(domain=DOMAIN, data=CONFIG))
+
+    state = hass.states.get(DEPARTURES_ENTITY_ID)
+    assert state.state == "0"
+    assert state.attributes["destination"] == "Parnell"
+    assert state.attributes["direction"] == "Inbound"
+    assert state.attributes["stop"] == "Sandyford"
+    assert len(state.attributes["departures"]) == NEXT_DEPARTURES
+    assert state.attributes["departures"] == [
+        {"due": due, "destination": "Parnell", "direction": "Inbound"}
+        for due in (0, 7, 9, 12)
+    ]
+
+
+async def test_per_departure_sensors_removed(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the sensors of the 2nd to 4th departures are removed."""
+    mock_forecasts(aioclient_mock)
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG)
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    for number in range(1, NEXT_DEPARTURES + 1):
+        unique_id = f"luas_from_san_to_par_inbound_{number}"
+        registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            unique_id,
+            suggested_object_id=unique_id,
+            config_entry=entry,
+        )
+
+    await setup_entry(hass, entry)
+
+    assert (
+        registry.async_get_entity_id("sensor", DOMAIN, "luas_from_san_to_par_inbound_1")
+        == DEPARTURES_ENTITY_ID
+    )
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == "0"
+    for number in range(2, NEXT_DEPARTURES + 1):
+        entity_id = f"sensor.luas_from_san_to_par_inbound_{number}"
+        assert registry.async_get(entity_id) is None
+        assert hass.states.get(entity_id) is None
+
+    notification = hass.states.get(
+        f"persistent_notification.{DOMAIN}_{entry.entry_id}_departures"
+    )
+    assert notification is not None
+    assert DEPARTURES_ENTITY_ID in notification.attributes["message"]
+    for number in range(2, NEXT_DEPARTURES + 1):
+        assert (
+            f"sensor.luas_from_san_to_par_inbound_{number}"
+            in notification.attributes["message"]
+        )
+
+
+async def test_no_notification_without_old_sensors(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test a new entry does not notify about removed sensors."""
+    mock_forecasts(aioclient_mock)
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG)
+    await setup_entry(hass, entry)
+
+    assert (
+        hass.states.get(f"persistent_notification.{DOMAIN}_{entry.entry_id}_departures")
+        is None
+    )
+
+
+async def test_availability(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the tram sensors follow the trams cached on each update."""
+    mock_forecasts(aioclient_mock)
+    await setup_entry(
+        hass, MockConfigEntry(domain=DOMAIN, data={**CONFIG, "walk_time": 3})
+    )
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == "0"
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == "4"
+
+    mock_forecasts(aioclient_mock, inbound=[], outbound=[])
+    await async_update_stop(hass)
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == STATE_UNAVAILABLE
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == STATE_UNAVAILABLE
+
+    mock_forecasts(aioclient_mock)
+    await async_update_stop(hass)
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == "0"
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == "4"
+
+    # The last trams are still in the coordinator data but it failed to update
+    mock_forecasts(aioclient_mock, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+    await async_update_stop(hass)
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == STATE_UNAVAILABLE
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == STATE_UNAVAILABLE
+
+    mock_forecasts(aioclient_mock, inbound=[("4", "Parnell"), ("10", "Parnell")])
+    await async_update_stop(hass)
+    state = hass.states.get(DEPARTURES_ENTITY_ID)
+    assert state.state == "4"
+    assert [departure["due"] for departure in state.attributes["departures"]] == [
+        4,
+        10,
+    ]
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == "1"
+
+
+async def test_wait_time(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the wait time is counted to the first tram reachable after walking."""
+    mock_forecasts(
+        aioclient_mock,
+        inbound=[
+            ("DUE", "Parnell"),
+            ("5", "Broombridge"),
+            ("7", "Parnell"),
+            ("9", "Parnell"),
+        ],
+    )
+    await setup_entry(
+        hass, MockConfigEntry(domain=DOMAIN, data={**CONFIG, "walk_time": 3})
+    )
+
+    state = hass.states.get(WAIT_TIME_ENTITY_ID)
+    assert state.state == "4"
+    assert state.attributes["unit_of_measurement"] == "min"
+
+
+async def test_wait_time_no_reachable_tram(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test the wait time is unavailable if every tram leaves while walking."""
+    mock_forecasts(
+        aioclient_mock,
+        inbound=[("DUE", "Parnell"), ("7", "Parnell"), ("9", "Parnell")],
+    )
+    await setup_entry(
+        hass, MockConfigEntry(domain=DOMAIN, data={**CONFIG, "walk_time": 9})
+    )
+
+    assert hass.states.get(WAIT_TIME_ENTITY_ID).state == STATE_UNAVAILABLE
+    assert hass.states.get(DEPARTURES_ENTITY_ID).state == "0"